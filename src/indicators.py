@@ -0,0 +1,279 @@
+"""Numba indicator kernels for the signal pipeline.
+
+All full-series indicators are computed by a single fused pass
+(compute_all); the *_resume / *_tail kernels continue the recurrences from
+persisted state so warm runs only touch the newest bars. Kernels carry
+explicit float32 signatures and compile eagerly at import, loading from the
+on-disk cache afterwards. Without numba everything runs as plain Python.
+"""
+
+import os
+
+import numpy as np
+
+# Keep the compiled kernels next to the source so every deployment and cron
+# invocation reuses the same on-disk cache instead of recompiling on first call
+os.environ.setdefault(
+    'NUMBA_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.numba_cache'))
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional, fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def decorator(func):
+            return func
+        return decorator
+
+# Fixed periods; module-level constants so the kernels compile against
+# literals and callers share one definition
+RSI_PERIOD = 14
+MACD_SIGNAL_PERIOD = 9
+MACD_SIGNAL_ALPHA = 2.0 / (MACD_SIGNAL_PERIOD + 1.0)
+BB_STD = 2.0
+
+@njit('Tuple((float32[:], float32[:], float32[:], float32[:], float32[:], '
+      'float32[:], float32[:], float32[:], float32[:], float32[:], float32[:], '
+      'float64, float64, float64, float64, float64))'
+      '(float32[:], int64, int64, int64, int64, int64)', cache=True)
+def compute_all(close, sma_short, sma_long, ema_short, ema_long, snap_at):
+    """Compute every indicator in one cache-resident pass over close.
+
+    Returns (sma_s, sma_l, ema_s, ema_l, rsi, macd, macd_signal, macd_hist,
+    bb_upper, bb_middle, bb_lower) plus the recurrence state
+    (avg_gain, avg_loss, macd_ema_fast, macd_ema_slow, macd_signal_ema) as
+    of bar snap_at for streaming resumption. SMAs/Bollinger use incremental
+    running sums, EMAs/RSI/MACD their recurrences; the MACD fast/slow EMAs
+    are the ema_short/ema_long series, so they are computed once. Warmup
+    bars stay NaN. Accumulation happens in float64 scalars.
+    """
+    n = close.shape[0]
+    sma_s = np.full(n, np.nan, dtype=np.float32)
+    sma_l = np.full(n, np.nan, dtype=np.float32)
+    ema_s = np.full(n, np.nan, dtype=np.float32)
+    ema_l = np.full(n, np.nan, dtype=np.float32)
+    rsi = np.full(n, np.nan, dtype=np.float32)
+    macd = np.full(n, np.nan, dtype=np.float32)
+    macd_sig = np.full(n, np.nan, dtype=np.float32)
+    macd_hist = np.full(n, np.nan, dtype=np.float32)
+    bb_upper = np.full(n, np.nan, dtype=np.float32)
+    bb_middle = np.full(n, np.nan, dtype=np.float32)
+    bb_lower = np.full(n, np.nan, dtype=np.float32)
+
+    snap_gain = np.nan
+    snap_loss = np.nan
+    snap_fast = np.nan
+    snap_slow = np.nan
+    snap_sig = np.nan
+    if n == 0:
+        return (sma_s, sma_l, ema_s, ema_l, rsi, macd, macd_sig, macd_hist,
+                bb_upper, bb_middle, bb_lower,
+                snap_gain, snap_loss, snap_fast, snap_slow, snap_sig)
+
+    alpha_short = 2.0 / (ema_short + 1.0)
+    alpha_long = 2.0 / (ema_long + 1.0)
+    alpha_sig = MACD_SIGNAL_ALPHA
+
+    sum_s = 0.0
+    sum_sq = 0.0
+    sum_l = 0.0
+    ema_s_val = close[0]
+    ema_l_val = close[0]
+    smoothed = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(n):
+        x = close[i]
+
+        # Short SMA + Bollinger share the same running window
+        sum_s += x
+        sum_sq += x * x
+        if i >= sma_short:
+            y = close[i - sma_short]
+            sum_s -= y
+            sum_sq -= y * y
+        if i >= sma_short - 1:
+            mean = sum_s / sma_short
+            sma_s[i] = mean
+            var = sum_sq / sma_short - mean * mean
+            if var < 0.0:
+                var = 0.0  # guard against rounding in the running sums
+            std = var ** 0.5
+            bb_middle[i] = mean
+            bb_upper[i] = mean + BB_STD * std
+            bb_lower[i] = mean - BB_STD * std
+
+        # Long SMA
+        sum_l += x
+        if i >= sma_long:
+            sum_l -= close[i - sma_long]
+        if i >= sma_long - 1:
+            sma_l[i] = sum_l / sma_long
+
+        # EMAs; these double as the MACD fast/slow lines
+        if i > 0:
+            ema_s_val = alpha_short * x + (1.0 - alpha_short) * ema_s_val
+            ema_l_val = alpha_long * x + (1.0 - alpha_long) * ema_l_val
+        ema_s[i] = ema_s_val
+        ema_l[i] = ema_l_val
+
+        line = ema_s_val - ema_l_val
+        if i > 0:
+            smoothed = alpha_sig * line + (1.0 - alpha_sig) * smoothed
+        else:
+            smoothed = line
+        macd[i] = line
+        macd_sig[i] = smoothed
+        macd_hist[i] = line - smoothed
+
+        # RSI with Wilder's smoothing
+        if i > 0:
+            delta = x - close[i - 1]
+            gain = delta if delta > 0.0 else 0.0
+            loss = -delta if delta < 0.0 else 0.0
+            if i <= RSI_PERIOD:
+                avg_gain += gain
+                avg_loss += loss
+                if i == RSI_PERIOD:
+                    avg_gain /= RSI_PERIOD
+                    avg_loss /= RSI_PERIOD
+                    if avg_loss == 0.0:
+                        rsi[i] = 100.0
+                    else:
+                        rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            else:
+                avg_gain = (avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                avg_loss = (avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+                if avg_loss == 0.0:
+                    rsi[i] = 100.0
+                else:
+                    rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        if i == snap_at:
+            snap_gain = avg_gain
+            snap_loss = avg_loss
+            snap_fast = ema_s_val
+            snap_slow = ema_l_val
+            snap_sig = smoothed
+
+    return (sma_s, sma_l, ema_s, ema_l, rsi, macd, macd_sig, macd_hist,
+            bb_upper, bb_middle, bb_lower,
+            snap_gain, snap_loss, snap_fast, snap_slow, snap_sig)
+
+@njit('Tuple((float64, float64))(float32[:], int64, int64, float64, float64, float32[:], int64)',
+      cache=True)
+def rsi_resume(close, start, period, avg_gain, avg_loss, out, snap_at):
+    """Continue Wilder's RSI from stored state covering bars [start, n)."""
+    n = close.shape[0]
+    snap_gain = avg_gain
+    snap_loss = avg_loss
+    for i in range(start, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+        if avg_loss == 0.0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        if i == snap_at:
+            snap_gain = avg_gain
+            snap_loss = avg_loss
+    return snap_gain, snap_loss
+
+@njit('Tuple((float64, float64, float64))(float32[:], int64, int64, int64, int64, float64, float64, float64, float32[:], float32[:], float32[:], int64)',
+      cache=True)
+def macd_resume(close, start, fast, slow, signal,
+                ema_fast, ema_slow, smoothed, macd, sig, hist, snap_at):
+    """Continue MACD from stored EMA state covering bars [start, n)."""
+    alpha_fast = 2.0 / (fast + 1.0)
+    alpha_slow = 2.0 / (slow + 1.0)
+    alpha_sig = 2.0 / (signal + 1.0)
+    snap_fast = ema_fast
+    snap_slow = ema_slow
+    snap_sig = smoothed
+    for i in range(start, close.shape[0]):
+        x = close[i]
+        ema_fast = alpha_fast * x + (1.0 - alpha_fast) * ema_fast
+        ema_slow = alpha_slow * x + (1.0 - alpha_slow) * ema_slow
+        line = ema_fast - ema_slow
+        smoothed = alpha_sig * line + (1.0 - alpha_sig) * smoothed
+        macd[i] = line
+        sig[i] = smoothed
+        hist[i] = line - smoothed
+        if i == snap_at:
+            snap_fast = ema_fast
+            snap_slow = ema_slow
+            snap_sig = smoothed
+    return snap_fast, snap_slow, snap_sig
+
+@njit('void(float32[:], int64, float64, float32[:])', cache=True)
+def ema_resume(close, start, alpha, out):
+    """Continue an EMA recurrence; out[start-1] must hold the prior value."""
+    for i in range(start, close.shape[0]):
+        out[i] = alpha * close[i] + (1.0 - alpha) * out[i - 1]
+
+@njit('void(float32[:], int64, int64, float32[:])', cache=True)
+def sma_tail(close, start, window, out):
+    """Direct windowed SMA for just the tail bars [start, n)."""
+    for i in range(start, close.shape[0]):
+        if i >= window - 1:
+            total = 0.0
+            for j in range(i - window + 1, i + 1):
+                total += close[j]
+            out[i] = total / window
+
+@njit('void(float32[:], int64, int64, float64, float32[:], float32[:], float32[:])', cache=True)
+def bbands_tail(close, start, period, num_std, upper, middle, lower):
+    """Direct windowed Bollinger Bands for just the tail bars [start, n)."""
+    for i in range(start, close.shape[0]):
+        if i >= period - 1:
+            total = 0.0
+            total_sq = 0.0
+            for j in range(i - period + 1, i + 1):
+                total += close[j]
+                total_sq += close[j] * close[j]
+            mean = total / period
+            var = total_sq / period - mean * mean
+            if var < 0.0:
+                var = 0.0
+            std = var ** 0.5
+            middle[i] = mean
+            upper[i] = mean + num_std * std
+            lower[i] = mean - num_std * std
+
+@njit('Tuple((int64, float64))(boolean[:], boolean[:], float32[:], float32[:], float32[:], float32[:], int64, float64)',
+      cache=True)
+def trend(up, down, close, rsi, macd, macd_signal, confirmation, min_change):
+    """Evaluate the trend decision; returns (+1 bullish, -1 bearish, 0 neutral)
+    along with the latest price change in percent.
+
+    up/down are the precomputed price/SMA alignment flags; the alignment must
+    hold over the last `confirmation` bars for a signal.
+    """
+    n = close.shape[0]
+    change = (close[-1] - close[-2]) / close[-2] * 100.0
+    if confirmation > n:
+        return 0, change
+    up_ok = True
+    down_ok = True
+    for i in range(n - confirmation, n):
+        if not up[i]:
+            up_ok = False
+        if not down[i]:
+            down_ok = False
+    if (up_ok and
+            rsi[-1] > 50.0 and
+            macd[-1] > macd_signal[-1] and
+            change > min_change):
+        return 1, change
+    if (down_ok and
+            rsi[-1] < 50.0 and
+            macd[-1] < macd_signal[-1] and
+            change < -min_change):
+        return -1, change
+    return 0, change
@@ -3,13 +3,14 @@ from unittest.mock import Mock, patch
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import logging
 import sys
 import os
 
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from crypto_signal import CryptoSignal
+from crypto_signal import CryptoSignal, _chunk_messages
 
 @pytest.fixture
 def test_config():
@@ -61,6 +62,77 @@ def signal(test_config, tmp_path, mock_yfinance):
     
     return CryptoSignal(config_path=str(config_path))
 
+@pytest.fixture
+def cached_signal(test_config, tmp_path, mock_yfinance):
+    # Same config as `signal` but with the on-disk cache enabled so the
+    # indicator-state persistence paths are exercised
+    config = dict(test_config)
+    config['cache'] = {'enabled': True, 'dir': str(tmp_path / 'cache'), 'ttl_hours': 20}
+    config_path = tmp_path / "cached_config.yml"
+    import yaml
+    with open(config_path, 'w') as f:
+        yaml.dump(config, f)
+
+    return CryptoSignal(config_path=str(config_path))
+
+def test_calculate_indicators_resume_matches_full_recompute(cached_signal, caplog):
+    # Compute on N bars with a symbol (persisting recurrence state), append
+    # bars and recompute: the resumed tail must match a stateless full
+    # recompute, both in indicator values and in the trend decision
+    n = 300
+    np.random.seed(11)
+    close = (np.cumsum(np.random.normal(0, 1, n)) + 100).astype(np.float32)
+    index = pd.date_range(start='2024-01-01', periods=n, freq='1D')
+
+    def frame(k):
+        return pd.DataFrame({'close': close[:k]}, index=index[:k])
+
+    cached_signal.calculate_indicators(frame(n - 5), symbol='BTC/USDT')
+
+    with caplog.at_level(logging.INFO, logger='crypto_signal'):
+        resumed = cached_signal.calculate_indicators(frame(n), symbol='BTC/USDT')
+    assert 'Resuming indicators' in caplog.text, "resume path was not taken"
+
+    full = cached_signal.calculate_indicators(frame(n), symbol=None)
+
+    # The resume path only recomputes bars after the persisted snapshot, so
+    # compare the recomputed tail (appended bars plus confirmation window)
+    tail = cached_signal.trend_confirmation + 2
+    for col in ('sma_20', 'sma_50', 'ema_12', 'ema_26', 'rsi', 'macd',
+                'macd_signal', 'macd_hist', 'bb_upper', 'bb_middle', 'bb_lower'):
+        np.testing.assert_allclose(resumed[col].to_numpy()[-tail:],
+                                   full[col].to_numpy()[-tail:],
+                                   rtol=2e-3, err_msg=col)
+    np.testing.assert_array_equal(resumed['trend_up'].to_numpy()[-tail:],
+                                  full['trend_up'].to_numpy()[-tail:])
+    np.testing.assert_array_equal(resumed['trend_down'].to_numpy()[-tail:],
+                                  full['trend_down'].to_numpy()[-tail:])
+    assert cached_signal.check_trend(resumed) == cached_signal.check_trend(full)
+
+def test_fetch_all_historical_batches_symbols(signal):
+    # All symbols should be served from one yf.download call, sliced per ticker
+    index = pd.date_range(start='2024-01-01', periods=3, freq='1D')
+    frames = {}
+    for ticker in ('BTC-USD', 'ETH-USD'):
+        frames[ticker] = pd.DataFrame({
+            'Open': [1.0, 2.0, 3.0],
+            'High': [1.5, 2.5, 3.5],
+            'Low': [0.5, 1.5, 2.5],
+            'Close': [1.2, 2.2, 3.2],
+            'Volume': [10.0, 20.0, 30.0]
+        }, index=index)
+    batch = pd.concat(frames, axis=1)
+
+    with patch('crypto_signal.yf.download', return_value=batch) as mock_download:
+        results = signal.fetch_all_historical(['BTC/USDT', 'ETH/USDT'])
+
+    mock_download.assert_called_once()
+    assert 'BTC-USD ETH-USD' == mock_download.call_args.kwargs['tickers']
+    assert set(results) == {'BTC/USDT', 'ETH/USDT'}
+    for df in results.values():
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert len(df) == 3
+
 def test_get_historical_data(signal):
     # Test data retrieval
     df = signal.get_historical_data('BTC-USD', '1h', 100)
@@ -113,6 +185,26 @@ def test_calculate_indicators(signal):
     assert result['bb_upper'].mean() > result['bb_middle'].mean(), "BB upper should be above middle"
     assert result['bb_middle'].mean() > result['bb_lower'].mean(), "BB middle should be above lower"
 
+def test_normalize_ohlcv_zero_copy(signal):
+    # The working frame should reuse the fetched buffers when dtypes already
+    # match instead of copying them, and carry only the columns the pipeline
+    # reads as float32
+    raw = pd.DataFrame({
+        'Open': np.array([1.0, 2.0], dtype=np.float32),
+        'High': np.array([1.5, 2.5], dtype=np.float32),
+        'Low': np.array([0.5, 1.5], dtype=np.float32),
+        'Close': np.array([1.2, 2.2], dtype=np.float32),
+        'Volume': np.array([10.0, 20.0], dtype=np.float32),
+        'Dividends': np.array([0.0, 0.0]),
+        'Stock Splits': np.array([0.0, 0.0])
+    }, index=pd.date_range(start='2024-01-01', periods=2))
+
+    df = signal._normalize_ohlcv(raw)
+
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+    assert all(df[col].dtype == np.float32 for col in df.columns)
+    assert np.shares_memory(df['close'].to_numpy(), raw['Close'].to_numpy())
+
 def test_check_trend(signal):
     # Test trend checking
     df = pd.DataFrame({
@@ -132,13 +224,15 @@ def test_check_trend(signal):
     assert isinstance(trend, str)
     assert trend in ['bullish', 'bearish', 'neutral']
 
-@patch('crypto_signal.requests.post')
+@patch('crypto_signal.requests.Session.post')
 def test_send_discord_message(mock_post, signal):
     # Test Discord message sending
     mock_post.return_value.status_code = 204
     
     signal.send_discord_message('BTC-USD', 'bullish', 50000, 2.5)
-    
+    # Posts are delivered by the background worker; wait for it to drain
+    signal.flush_discord()
+
     # Verify the request was made with correct data
     mock_post.assert_called_once()
     args, kwargs = mock_post.call_args
@@ -146,4 +240,17 @@ def test_send_discord_message(mock_post, signal):
     assert 'BTC-USD' in kwargs['json']['content']
     assert 'bullish' in kwargs['json']['content']
     assert '50000' in kwargs['json']['content']
-    assert '2.5' in kwargs['json']['content'] 
\ No newline at end of file
+    assert '2.5' in kwargs['json']['content']
+
+def test_chunk_messages_batches_within_content_limit():
+    # Short messages coalesce into one payload; oversized batches split
+    assert _chunk_messages(['a', 'b', 'c']) == ['a\n\nb\n\nc']
+    long_a = 'x' * 1500
+    long_b = 'y' * 1500
+    assert _chunk_messages([long_a, long_b]) == [long_a, long_b]
+    assert _chunk_messages([long_a, 'tail']) == [long_a + '\n\ntail']
+    # A single oversized message is hard-split; no chunk may exceed the limit
+    oversized = 'z' * 4500
+    chunks = _chunk_messages(['head', oversized])
+    assert chunks == ['head', 'z' * 2000, 'z' * 2000, 'z' * 500]
+    assert all(len(chunk) <= 2000 for chunk in chunks)
\ No newline at end of file
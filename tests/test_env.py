@@ -9,6 +9,10 @@ import re
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Compiled once; recompiling the pattern per string is pure overhead when
+# recursing through a config tree
+_ENV_RE = re.compile(r'\$\{([^}]+)\}')
+
 def substitute_env_vars(obj):
     """Recursively substitute ${VAR} in strings with environment variables."""
     if isinstance(obj, dict):
@@ -16,8 +20,10 @@ def substitute_env_vars(obj):
     elif isinstance(obj, list):
         return [substitute_env_vars(i) for i in obj]
     elif isinstance(obj, str):
-        # Substitute ${VAR} with env var
-        return re.sub(r'\$\{([^}]+)\}', lambda m: os.getenv(m.group(1), m.group(0)), obj)
+        # Most config strings carry no placeholder; skip the regex for those
+        if '${' not in obj:
+            return obj
+        return _ENV_RE.sub(lambda m: os.environ.get(m.group(1), m.group(0)), obj)
     else:
         return obj
 
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import compute_all, RSI_PERIOD
+
+def _sample_close(n=200):
+    np.random.seed(7)
+    base = np.linspace(100, 140, n)
+    noise = np.random.normal(0, 2, n)
+    return (base + 5 * np.sin(np.linspace(0, 4 * np.pi, n)) + noise).astype(np.float32)
+
+def test_compute_all_matches_pandas_references():
+    close = _sample_close()
+    series = pd.Series(close.astype(np.float64))
+
+    (sma_s, sma_l, ema_s, ema_l, rsi, macd, macd_sig, macd_hist,
+     bb_upper, bb_middle, bb_lower, *_state) = compute_all(close, 20, 50, 12, 26, -1)
+
+    np.testing.assert_allclose(sma_s, series.rolling(20).mean(), rtol=1e-4)
+    np.testing.assert_allclose(sma_l, series.rolling(50).mean(), rtol=1e-4)
+    np.testing.assert_allclose(ema_s, series.ewm(span=12, adjust=False).mean(), rtol=1e-4)
+    np.testing.assert_allclose(ema_l, series.ewm(span=26, adjust=False).mean(), rtol=1e-4)
+
+    ref_macd = (series.ewm(span=12, adjust=False).mean() -
+                series.ewm(span=26, adjust=False).mean())
+    np.testing.assert_allclose(macd, ref_macd, rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(macd_sig, ref_macd.ewm(span=9, adjust=False).mean(),
+                               rtol=1e-3, atol=1e-3)
+    np.testing.assert_allclose(macd_hist, macd - macd_sig, rtol=1e-3, atol=1e-3)
+
+    mid = series.rolling(20).mean()
+    std = series.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(bb_middle, mid, rtol=1e-4)
+    np.testing.assert_allclose(bb_upper, mid + 2 * std, rtol=1e-3)
+    np.testing.assert_allclose(bb_lower, mid - 2 * std, rtol=1e-3)
+
+    # Wilder's RSI reference via the equivalent ewm alpha after seeding with
+    # the simple average of the first `period` deltas
+    delta = series.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.ewm(alpha=1 / RSI_PERIOD, min_periods=RSI_PERIOD, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / RSI_PERIOD, min_periods=RSI_PERIOD, adjust=False).mean()
+    ref_rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    # ewm seeds differently from Wilder's simple-average warmup, so skip the
+    # first stretch where the two recurrences are still converging
+    np.testing.assert_allclose(rsi[100:], ref_rsi[100:], rtol=5e-2)
+    assert np.isnan(rsi[:RSI_PERIOD]).all()
+    assert ((rsi[RSI_PERIOD:] >= 0) & (rsi[RSI_PERIOD:] <= 100)).all()
+
+def test_compute_all_snapshot_state_resumes_recurrences():
+    close = _sample_close()
+    n = close.shape[0]
+    snap_at = n - 4
+
+    full = compute_all(close, 20, 50, 12, 26, snap_at)
+    avg_gain, avg_loss, ema_fast, ema_slow, macd_sig = full[11:]
+
+    # Recomputing on the truncated series with the snapshot as the final bar
+    # must land on the same state the full pass reported
+    truncated = compute_all(close[:snap_at + 1], 20, 50, 12, 26, snap_at)
+    np.testing.assert_allclose(
+        truncated[11:], (avg_gain, avg_loss, ema_fast, ema_slow, macd_sig), rtol=1e-6)
+    # The snapshot EMA state is the EMA series value at that bar
+    np.testing.assert_allclose(ema_fast, full[2][snap_at], rtol=1e-5)
+    np.testing.assert_allclose(ema_slow, full[3][snap_at], rtol=1e-5)
+
+def test_compute_all_empty_input():
+    empty = np.empty(0, dtype=np.float32)
+    out = compute_all(empty, 20, 50, 12, 26, -1)
+    for arr in out[:11]:
+        assert arr.shape == (0,)
+    for scalar in out[11:]:
+        assert np.isnan(scalar)